@@ -1,20 +1,128 @@
 import argparse
-import copy
-import json
+import asyncio
+import collections
+import functools
 import logging
 import os
-import time
+import sys
+import threading
 
-import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+import fastjsonschema
+import httpx
+import ijson
+import orjson
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+MAX_CONCURRENT_REQUESTS = 32
+MAX_RATE_LIMIT_RETRIES = 5
+MAX_STATUS_FETCH_ERRORS = 5
+RATE_LIMIT_WAIT = 61
+POLL_BASE_INTERVAL = 1.0
+POLL_MAX_INTERVAL = 60.0
+POLL_BACKOFF_FACTOR = 1.5
+ETAG_CACHE_SIZE = 1024
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=MAX_CONCURRENT_REQUESTS,
+    max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+)
+
+# only what generate_filtered_config relies on , other keys pass through to the api as is
+PROPERTIES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "iso3": {"type": ["string", "null"]},
+        "categories": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "additionalProperties": {
+                    "type": "object",
+                    "properties": {"select": {"type": "array"}},
+                    # extended with the language fields , so it has to be there
+                    "required": ["select"],
+                },
+            },
+        },
+    },
+}
+
+
+def iter_json_items(response):
+    # parses items of a json array response as chunks arrive instead of loading the whole body
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, "item", use_float=True)
+    for chunk in response.iter_bytes():
+        parser.send(chunk)
+        yield from items
+        del items[:]
+    parser.close()
+    yield from items
+
+
+def install_uvloop():
+    # libuv based event loop for the concurrent requests , asyncio default is kept otherwise
+    if uvloop is not None and sys.platform != "win32":
+        uvloop.install()
+
+
+class ResultWriter:
+    # streams task results into result.json as they finish , so nothing is held in memory
+    # and results of completed tasks survive a crash mid tracking
+    def __init__(self, path="result.json"):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "wb")
+        self._file.write(b"{")
+        return self
+
+    def write(self, task_id, result):
+        self._file.write(b",\n  " if self.count else b"\n  ")
+        self._file.write(orjson.dumps(task_id) + b": " + orjson.dumps(result))
+        self._file.flush()
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._file.write(b"\n}\n")
+        self._file.close()
 
 
 class CountryProcessor:
-    def __init__(self, config_json=None, language_json="language.json"):
+    # fixed attribute set , avoids a per instance __dict__ on the request paths
+    __slots__ = (
+        "config",
+        "languages",
+        "RAW_DATA_API_BASE_URL",
+        "RAW_DATA_SNAPSHOT_URL",
+        "RAWDATA_API_AUTH_TOKEN",
+        "_headers",
+        "_validate_properties",
+        "_config_fragments",
+        "_cached_config_categories",
+        "_etag_cache",
+        "_etag_lock",
+        "_client",
+        "_rate_limit_event",
+    )
+
+    def __init__(
+        self,
+        config_json=None,
+        language_json="language.json",
+        raw_data_api_base_url=None,
+        rawdata_api_auth_token=None,
+    ):
         if config_json is None:
             raise ValueError("Config JSON couldn't be found")
 
@@ -22,7 +130,7 @@ class CountryProcessor:
             self.config = config_json
         elif os.path.exists(config_json):
             with open(config_json) as f:
-                self.config = json.load(f)
+                self.config = orjson.loads(f.read())
         else:
             raise ValueError("Invalid value for config_json")
         self.languages = None
@@ -30,109 +138,362 @@ class CountryProcessor:
             self.languages = language_json
         elif os.path.exists(language_json):
             with open(language_json) as f:
-                self.languages = json.load(f)
+                self.languages = orjson.loads(f.read())
+
+        self.RAW_DATA_API_BASE_URL = raw_data_api_base_url or os.environ.get(
+            "RAW_DATA_API_BASE_URL"
+        )
+        self.RAWDATA_API_AUTH_TOKEN = rawdata_api_auth_token or os.environ.get(
+            "RAWDATA_API_AUTH_TOKEN"
+        )
+        self.RAW_DATA_SNAPSHOT_URL = f"{self.RAW_DATA_API_BASE_URL}/custom/snapshot/"
+        self._headers = {"Content-Type": "application/json"}
+        if self.RAWDATA_API_AUTH_TOKEN:
+            # httpx rejects None header values , requests used to drop them silently
+            self._headers["Access-Token"] = self.RAWDATA_API_AUTH_TOKEN
+
+        self._validate_properties = fastjsonschema.compile(PROPERTIES_SCHEMA)
+        self._config_fragments = {
+            key: orjson.dumps(value) for key, value in self.config.items()
+        }
+        self._cached_config_categories = functools.lru_cache(maxsize=256)(
+            self._config_categories
+        )
 
-        self.RAW_DATA_API_BASE_URL = os.environ.get("RAW_DATA_API_BASE_URL")
-        self.RAWDATA_API_AUTH_TOKEN = os.environ.get("RAWDATA_API_AUTH_TOKEN")
+        # url : (ETag, body) for conditional GETs , least recently used first
+        self._etag_cache = collections.OrderedDict()
+        # the sync client fetching exports in a worker thread shares it with the event loop
+        self._etag_lock = threading.Lock()
+        # transport retries cover connection failures , 429/502 are retried in _post_async
+        self._client = httpx.Client(
+            headers=self._headers,
+            timeout=10,
+            transport=httpx.HTTPTransport(http2=True, retries=2, limits=HTTP_LIMITS),
+        )
 
     def generate_filtered_config(self, export):
-        config_temp = copy.deepcopy(self.config)
-        for key in export["properties"].keys():
-            # overwrite config.json keys if it is already in predefined export keys
-            config_temp[key] = export["properties"].get(key)
-        print(config_temp.get("iso3"))
-        if config_temp.get("iso3"):
-            if self.languages:
-                language_select = self.languages.get(config_temp.get("iso3"))
-                if language_select:
-                    for category_group in config_temp.get("categories"):
-                        for category in category_group:
-                            category_group[category]["select"] = (
-                                category_group[category].get("select") + language_select
-                            )
-        return json.dumps(config_temp)
-
-    def process_export(self, export):
-        request_config = self.generate_filtered_config(export)
-        response = self.retry_post_request(request_config)
-        return response
-
-    def retry_post_request(self, request_config):
-        retry_strategy = Retry(
-            total=2,  # Number of retries
-            status_forcelist=[429, 502],
-            allowed_methods=["POST"],
-            backoff_factor=1,
+        properties = export["properties"]
+        # overwrite config.json keys if it is already in predefined export keys ,
+        # untouched keys reuse the fragments serialized once in __init__
+        fragments = dict(self._config_fragments)
+        for key, value in properties.items():
+            fragments[key] = orjson.dumps(value)
+
+        iso3 = properties.get("iso3", self.config.get("iso3"))
+        if iso3 and self.languages:
+            language_select = self.languages.get(iso3)
+            if language_select:
+                if "categories" in properties:
+                    fragments["categories"] = self._extend_categories(
+                        properties["categories"], language_select
+                    )
+                else:
+                    # config categories are shared by every export of a country
+                    fragments["categories"] = self._cached_config_categories(iso3)
+        return (
+            b"{"
+            + b",".join(
+                orjson.dumps(key) + b":" + fragment
+                for key, fragment in fragments.items()
+            )
+            + b"}"
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        with requests.Session() as req_session:
-            req_session.mount("https://", adapter)
-            req_session.mount("http://", adapter)
+    def _config_categories(self, iso3):
+        return self._extend_categories(
+            self.config.get("categories"), self.languages.get(iso3)
+        )
+
+    def _extend_categories(self, categories, language_select):
+        # rebuild only the categories being extended so the source is never mutated
+        return orjson.dumps(
+            [
+                {
+                    category: {
+                        **category_value,
+                        "select": category_value.get("select") + language_select,
+                    }
+                    for category, category_value in category_group.items()
+                }
+                for category_group in categories
+            ]
+        )
 
+    def validate_export(self, export):
+        properties = export.get("properties")
         try:
-            HEADERS = {
-                "Content-Type": "application/json",
-                "Access-Token": self.RAWDATA_API_AUTH_TOKEN,
-            }
-            RAW_DATA_SNAPSHOT_URL = f"{self.RAW_DATA_API_BASE_URL}/custom/snapshot/"
-            response = req_session.post(
-                RAW_DATA_SNAPSHOT_URL,
-                headers=HEADERS,
-                data=request_config,
-                timeout=10,
+            self._validate_properties(properties)
+            return True
+        except fastjsonschema.JsonSchemaException as ex:
+            # properties may not even be an object here , so don't assume .get()
+            iso3 = properties.get("iso3") if isinstance(properties, dict) else None
+            logger.error(
+                "Skipping export %s , invalid properties: %s", iso3, ex.message
             )
-            response.raise_for_status()
-            return response.json()["task_id"]
-        except requests.exceptions.RetryError as e:
-            self.handle_rate_limit()
-            return self.retry_post_request(request_config)
+            return False
+
+    def _async_client(self):
+        # http2 multiplexes the concurrent requests over a single connection
+        # pool waits are unbounded , concurrency is already capped by the semaphores
+        return httpx.AsyncClient(
+            headers=self._headers,
+            timeout=httpx.Timeout(10, pool=None),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True, retries=2, limits=HTTP_LIMITS
+            ),
+        )
 
-    def handle_rate_limit(self):
-        logging.warning("Rate limit reached. Waiting for 1 minute before retrying.")
-        time.sleep(61)
+    async def process_export_async(self, client, export):
+        request_config = self.generate_filtered_config(export)
+        return await self._post_async(client, request_config)
+
+    async def _post_async(self, client, request_config):
+        # 2 retries with backoff on 429/502 before waiting for the rate limit
+        post, url = client.post, self.RAW_DATA_SNAPSHOT_URL
+        rate_limit_event = self._rate_limit_event
+        max_retries = 2
+        for rate_limit_retry in range(MAX_RATE_LIMIT_RETRIES):
+            for retry in range(max_retries + 1):
+                await rate_limit_event.wait()
+                response = await post(url, content=request_config)
+                if response.status_code not in [429, 502]:
+                    response.raise_for_status()
+                    return orjson.loads(response.content)["task_id"]
+                if retry < max_retries:
+                    await asyncio.sleep(2**retry)
+            # no point waiting out the limit when no attempt follows
+            if rate_limit_retry < MAX_RATE_LIMIT_RETRIES - 1:
+                await self.handle_rate_limit_async()
+        logger.error(
+            "Rate limit retries exhausted after %s attempts, Skipping export",
+            MAX_RATE_LIMIT_RETRIES,
+        )
+        return None
 
-    def retry_get_request(self, url):
+    async def _submit_all(self, client, exports, queue=None):
+        # whole submission pipeline , not a fixed size batch : Raw Data API has no bulk
+        # snapshot endpoint, so every export is sent over the client's keep-alive
+        # connections , at most MAX_CONCURRENT_REQUESTS at a time , and each task id is
+        # handed to the tracker queue when given.
+        # exports can be a lazy iterator doing blocking fetches , so it is advanced in a
+        # thread and only as fast as submissions free up , overlapping fetch and submit
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        process_export_async = self.process_export_async
+
+        async def submit(export):
+            try:
+                task_id = await process_export_async(client, export)
+            finally:
+                semaphore.release()
+            if queue is not None and task_id is not None:
+                # hand it to the tracker right away instead of after all submissions
+                await queue.put(task_id)
+            return task_id
+
+        exports, exhausted = iter(exports), object()
+        tasks, fetch_error = [], None
+        while True:
+            await semaphore.acquire()
+            try:
+                export = await asyncio.to_thread(next, exports, exhausted)
+            except Exception as ex:
+                # exports already sent still get their task ids , the error is raised after
+                logger.error("Stopped taking exports , fetching failed: %s", ex)
+                export, fetch_error = exhausted, ex
+            if export is exhausted:
+                semaphore.release()
+                break
+            tasks.append(asyncio.create_task(submit(export)))
+        logger.info("Supplied %s exports", len(tasks))
+        responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+        task_ids = []
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.error("Error in POST request: %s", response)
+            elif response is not None:
+                task_ids.append(response)
+        return task_ids, fetch_error
+
+    async def _submit_exports(self, client, exports, queue=None):
+        # set while requests may flow , cleared while waiting out a rate limit
+        self._rate_limit_event = asyncio.Event()
+        self._rate_limit_event.set()
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logging.error("Error in GET request: %s", str(e))
-            return {"status": "ERROR"}
+            return await self._submit_all(client, exports, queue)
+        finally:
+            if queue is not None:
+                await queue.put(None)  # tells the tracker submissions are done
+
+    async def _run_exports(self, exports, writer=None):
+        # with a result writer , statuses are tracked while exports are still being sent
+        queue = asyncio.Queue() if writer else None
+        async with self._async_client() as client:
+            submitter = self._submit_exports(client, exports, queue)
+            if writer is None:
+                return await submitter
+            submitted, _ = await asyncio.gather(
+                submitter, self._track_tasks(client, queue, writer)
+            )
+            return submitted
+
+    async def handle_rate_limit_async(self):
+        # first request to hit the limit schedules the reset , others wait on the same one
+        if self._rate_limit_event.is_set():
+            logger.warning("Rate limit reached. Waiting for 1 minute before retrying.")
+            self._rate_limit_event.clear()
+            asyncio.get_running_loop().call_later(
+                RATE_LIMIT_WAIT, self._rate_limit_event.set
+            )
+        await self._rate_limit_event.wait()
+
+    def _conditional_headers(self, url):
+        with self._etag_lock:
+            cached = self._etag_cache.get(url)
+        return {"If-None-Match": cached[0]} if cached else {}
+
+    def _response_content(self, url, response):
+        # 304 means the body seen with this ETag is still current , reuse it
+        if response.status_code == 304:
+            with self._etag_lock:
+                cached = self._etag_cache.get(url)
+                if cached:
+                    self._etag_cache.move_to_end(url)
+            if cached:
+                return cached[1]
+        response.raise_for_status()
+        etag = response.headers.get("ETag")
+        if etag:
+            with self._etag_lock:
+                self._etag_cache[url] = (etag, response.content)
+                self._etag_cache.move_to_end(url)
+                if len(self._etag_cache) > ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        return response.content
+
+    def _forget_etag(self, url):
+        with self._etag_lock:
+            self._etag_cache.pop(url, None)
+
+    def _status_url(self, task_id):
+        return f"{self.RAW_DATA_API_BASE_URL}/tasks/status/{task_id}/"
+
+    async def _get_async(self, client, url):
+        try:
+            response = await client.get(url, headers=self._conditional_headers(url))
+            return orjson.loads(self._response_content(url, response))
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            # None marks a failed fetch , not a task outcome
+            logger.error("Error in GET request: %s", e)
+            return None
+
+    async def _poll_statuses(self, client, task_ids):
+        # Raw Data API has no multi status endpoint , so a tick polls all tasks concurrently
+        get, status_url = self._get_async, self._status_url
+        # bounded like submission so hundreds of tasks do not queue on the pool at once
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def poll(task_id):
+            async with semaphore:
+                return await get(client, status_url(task_id))
+
+        responses = await asyncio.gather(*[poll(task_id) for task_id in task_ids])
+        return zip(task_ids, responses)
+
+    def _schedule_poll(self, state, now):
+        delay = min(
+            POLL_MAX_INTERVAL, POLL_BASE_INTERVAL * POLL_BACKOFF_FACTOR ** state[1]
+        )
+        state[1] += 1
+        state[2] = now + delay
+
+    async def _track_tasks(self, client, queue, writer):
+        # polls task ids as they arrive on the queue until the None sentinel is received ,
+        # each task backs off on its own schedule so new arrivals don't speed up the rest
+        alive = {}  # task_id : [last seen status or None , attempt , next poll time]
+        statuses = collections.Counter()
+        fetch_errors = collections.Counter()  # task_id : consecutive failed status GETs
+        submitting = True
+        loop = asyncio.get_running_loop()
+        next_report = loop.time() + POLL_MAX_INTERVAL
+        while submitting or alive:
+            timeout = None
+            if alive:
+                next_poll = min(state[2] for state in alive.values())
+                timeout = max(0, next_poll - loop.time())
+            task_ids = []
+            if submitting:
+                try:
+                    # wakes early when a new task id comes in so it is checked right away
+                    task_ids.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(timeout)
+            while not queue.empty():
+                task_ids.append(queue.get_nowait())
+            now = loop.time()
+            for task_id in task_ids:
+                if task_id is None:
+                    submitting = False
+                else:
+                    alive[task_id] = [None, 0, now]
+
+            due = [task_id for task_id, state in alive.items() if state[2] <= now]
+            if not due:
+                continue
+            for task_id, response in await self._poll_statuses(client, due):
+                state = alive[task_id]
+                if response is None:
+                    fetch_errors[task_id] += 1
+                    if fetch_errors[task_id] < MAX_STATUS_FETCH_ERRORS:
+                        # keep the task alive , it is asked again on its next poll
+                        self._schedule_poll(state, loop.time())
+                        continue
+                    logger.error("Giving up on status of task %s", task_id)
+                    statuses["FETCH_ERROR"] += 1
+                    writer.write(task_id, "FAILURE")
+                    del alive[task_id], fetch_errors[task_id]
+                    self._forget_etag(self._status_url(task_id))
+                    continue
+                fetch_errors.pop(task_id, None)
+                if response["status"] in ["PENDING", "STARTED"]:
+                    if state[0] is not None and response["status"] != state[0]:
+                        # a task moved on eg : PENDING -> STARTED , poll quickly again
+                        state[1] = 0
+                    state[0] = response["status"]
+                    self._schedule_poll(state, loop.time())
+                    continue
+                if response["status"] in ["SUCCESS", "ERROR", "FAILURE"]:
+                    logger.debug("Task %s is %s", task_id, response["status"])
+                    statuses[response["status"]] += 1
+                    writer.write(task_id, response.get("result"))
+                else:
+                    statuses["FAILURE"] += 1
+                    writer.write(task_id, "FAILURE")
+                del alive[task_id]
+                # a finished task is never polled again , don't keep its body around
+                self._forget_etag(self._status_url(task_id))
+            # progress at most once per POLL_MAX_INTERVAL , not on every wake up
+            if alive and loop.time() >= next_report:
+                logger.info("%s tasks are still running", len(alive))
+                next_report = loop.time() + POLL_MAX_INTERVAL
+        # one summary instead of a log line per finished task
+        logger.info("Tracked %s tasks : %s", sum(statuses.values()), dict(statuses))
+
+    async def _track_task_ids(self, task_ids, writer):
+        queue = asyncio.Queue()
+        for task_id in task_ids:
+            queue.put_nowait(task_id)
+        queue.put_nowait(None)
+        async with self._async_client() as client:
+            await self._track_tasks(client, queue, writer)
 
     def track_tasks_status(self, task_ids):
-        results = {}
-
-        for task_id in task_ids:
-            status_url = f"{self.RAW_DATA_API_BASE_URL}/tasks/status/{task_id}/"
-            response = self.retry_get_request(status_url)
-
-            if response["status"] == "SUCCESS":
-                results[task_id] = response["result"]
-            elif response["status"] in ["PENDING", "STARTED"]:
-                while True:
-                    response = self.retry_get_request(status_url)
-                    if response["status"] in ["SUCCESS", "ERROR", "FAILURE"]:
-                        results[task_id] = response["result"]
-                        logging.info(
-                            "Task %s is %s , Moving to fetch next one",
-                            task_id,
-                            response["status"],
-                        )
-                        break
-                    logging.warning(
-                        "Task %s is %s. Retrying in 30 seconds...",
-                        task_id,
-                        response["status"],
-                    )
-                    time.sleep(30)
-            else:
-                results[task_id] = "FAILURE"
-        logging.info("%s tasks stats is fetched, Dumping result", len(results))
-        with open("result.json", "w") as f:
-            json.dump(results, f, indent=2)
-        logging.info("Done ! Find result at result.json")
+        with ResultWriter() as writer:
+            asyncio.run(self._track_task_ids(task_ids, writer))
+        logger.info("%s tasks stats is fetched", writer.count)
+        logger.info("Done ! Find result at %s", writer.path)
 
     def clean_hdx_export_response(self, feature):
         feature["properties"].pop("id")
@@ -149,30 +510,35 @@ class CountryProcessor:
         return feature
 
     def get_scheduled_exports(self, frequency):
-        combined_results = []
         max_retries = 3
         limit = 100
         skip = 0
 
         while True:
+            page_count = 0
             for retry in range(max_retries):
                 try:
                     active_projects_api_url = f"{self.RAW_DATA_API_BASE_URL}/cron/?update_frequency={frequency}&skip={skip}&limit={limit}"
-                    response = requests.get(active_projects_api_url, timeout=10)
-                    response.raise_for_status()
-                    data = response.json()
-                    if not data:
-                        return combined_results
-                    combined_results.extend(data)
+                    with self._client.stream(
+                        "GET", active_projects_api_url
+                    ) as response:
+                        response.raise_for_status()
+                        for index, feature in enumerate(iter_json_items(response)):
+                            # a retried page skips the features already yielded
+                            if index >= page_count:
+                                page_count += 1
+                                yield feature
                     break
                 except Exception as e:
-                    logging.warning(
-                        f"Request failed (attempt {retry + 1}/{max_retries}): {e}"
+                    logger.warning(
+                        "Request failed (attempt %s/%s): %s", retry + 1, max_retries, e
                     )
             else:
                 raise Exception(
                     f"Failed to fetch scheduled projects after {max_retries} attempts"
                 )
+            if page_count == 0:
+                return
 
             skip += limit
 
@@ -181,36 +547,35 @@ class CountryProcessor:
         max_retries = 3
         for retry in range(max_retries):
             try:
-                logging.info("Fetching Hdx export details %s:%s", key, value)
-                response = requests.get(project_api_url, timeout=20)
-                response.raise_for_status()
-                response = response.json()
+                logger.info("Fetching Hdx export details %s:%s", key, value)
+                response = self._client.get(
+                    project_api_url,
+                    headers=self._conditional_headers(project_api_url),
+                    timeout=20,
+                )
+                response = orjson.loads(
+                    self._response_content(project_api_url, response)
+                )
                 if not response[0]:
-                    logging.error("Feature not found")
+                    logger.error("Feature not found")
                     return None
                 feature = self.clean_hdx_export_response(response[0])
                 return feature
             except Exception as ex:
-                logging.warning(
+                logger.warning(
                     "Request failed (attempt %s/%s): %s", retry + 1, max_retries, ex
                 )
-        logging.error(
+        logger.error(
             "Failed to fetch hdx export details %s:%s after 3 retries", key, value
         )
         return None
 
-    def init_call(self, iso3=None, ids=None, fetch_scheduled_exports=None):
-        all_export_details = []
-        if iso3:
-            for country in iso3:
-                all_export_details.append(
-                    self.get_hdx_project_details(key="iso3", value=country.upper())
-                )
-        if ids:
-            for hdx_id in ids:
-                all_export_details.append(
-                    self.get_hdx_project_details(key="id", value=hdx_id)
-                )
+    def iter_exports(self, iso3=None, ids=None, fetch_scheduled_exports=None):
+        # yields exports one by one so they can be submitted while the rest are fetched
+        for country in iso3 or []:
+            yield self.get_hdx_project_details(key="iso3", value=country.upper())
+        for hdx_id in ids or []:
+            yield self.get_hdx_project_details(key="id", value=hdx_id)
 
         if fetch_scheduled_exports:
             frequency = fetch_scheduled_exports
@@ -218,45 +583,62 @@ class CountryProcessor:
                 "Retrieving scheduled projects with frequency of  %s",
                 frequency,
             )
-            scheduled_exports = self.get_scheduled_exports(frequency)
-            for export in scheduled_exports:
+            for export in self.get_scheduled_exports(frequency):
                 if export:
-                    all_export_details.append(self.clean_hdx_export_response(export))
-
-        task_ids = []
+                    yield self.clean_hdx_export_response(export)
 
-        logger.info("Supplied %s exports", len(all_export_details))
-        for export in all_export_details:
-            if export:
-                task_id = self.process_export(export)
-                if task_id is not None:
-                    task_ids.append(task_id)
-        logging.info(
+    def init_call(self, iso3=None, ids=None, fetch_scheduled_exports=None, track=False):
+        all_export_details = (
+            export
+            for export in self.iter_exports(iso3, ids, fetch_scheduled_exports)
+            if export and self.validate_export(export)
+        )
+        if track:
+            with ResultWriter() as writer:
+                task_ids, fetch_error = asyncio.run(
+                    self._run_exports(all_export_details, writer)
+                )
+        else:
+            task_ids, fetch_error = asyncio.run(self._run_exports(all_export_details))
+        logger.info(
             "Request : All request to %s has been sent, Logging %s task_ids",
             self.RAW_DATA_API_BASE_URL,
             len(task_ids),
         )
-        logging.info(task_ids)
+        logger.info("Task ids : %s", task_ids)
+        if track:
+            logger.info("%s tasks stats is fetched", writer.count)
+            logger.info("Done ! Find result at %s", writer.path)
+        if fetch_error is not None:
+            raise fetch_error
         return task_ids
 
 
+# kept across warm lambda invocations so config parsing and the http client are reused
+_PROCESSOR = None
+
+
 def lambda_handler(event, context):
-    config_json = os.environ.get("CONFIG_JSON", None)
-    if config_json is None:
-        raise ValueError("Config JSON couldn't be found in env")
-    if os.environ.get("RAWDATA_API_AUTH_TOKEN", None) is None:
-        raise ValueError("RAWDATA_API_AUTH_TOKEN environment variable not found.")
+    global _PROCESSOR
+    if _PROCESSOR is None:
+        install_uvloop()
+        config_json = os.environ.get("CONFIG_JSON", None)
+        if config_json is None:
+            raise ValueError("Config JSON couldn't be found in env")
+        if os.environ.get("RAWDATA_API_AUTH_TOKEN", None) is None:
+            raise ValueError("RAWDATA_API_AUTH_TOKEN environment variable not found.")
+        _PROCESSOR = CountryProcessor(config_json)
     iso3 = event.get("iso3", None)
     ids = event.get("ids", None)
     fetch_scheduled_exports = event.get("fetch_scheduled_exports", "daily")
 
-    hdx_processor = CountryProcessor(config_json)
-    hdx_processor.init_call(
+    _PROCESSOR.init_call(
         iso3=iso3, ids=ids, fetch_scheduled_exports=fetch_scheduled_exports
     )
 
 
 def main():
+    install_uvloop()
     parser = argparse.ArgumentParser(
         description="Triggers extraction request for Hdx extractions projects"
     )
@@ -295,13 +677,12 @@ def main():
     if os.environ.get("RAWDATA_API_AUTH_TOKEN", None) is None:
         raise ValueError("RAWDATA_API_AUTH_TOKEN environment variable not found.")
     hdx_processor = CountryProcessor(config_json, language_json)
-    task_ids = hdx_processor.init_call(
+    hdx_processor.init_call(
         iso3=args.iso3,
         ids=args.ids,
         fetch_scheduled_exports=args.fetch_scheduled_exports,
+        track=args.track,
     )
-    if args.track:
-        hdx_processor.track_tasks_status(task_ids)
 
 
 if __name__ == "__main__":
@@ -139,11 +139,10 @@ def main():
         extraction_in_progress = True
         spinner = st.spinner("Extracting... Please wait.")
         with spinner:
-            hdx_processor = CountryProcessor(config_data)
-
-            hdx_processor.RAW_DATA_API_BASE_URL = raw_data_api_base_url
-            hdx_processor.RAWDATA_API_AUTH_TOKEN = (
-                st.session_state.rawdata_api_auth_token
+            hdx_processor = CountryProcessor(
+                config_data,
+                raw_data_api_base_url=raw_data_api_base_url,
+                rawdata_api_auth_token=st.session_state.rawdata_api_auth_token,
             )
 
             selected_iso3_values = [iso3 for iso3, _ in selected_iso3]
@@ -152,6 +151,7 @@ def main():
                 iso3=selected_iso3_values,
                 ids=selected_hdx_ids_values,
                 fetch_scheduled_exports=frequency,
+                track=track,
             )
 
             if (
@@ -164,8 +164,6 @@ def main():
                 )
 
             if track:
-                hdx_processor.track_tasks_status(task_ids)
-
                 result_file_path = os.path.join(os.getcwd(), "result.json")
                 if os.path.exists(result_file_path):
                     with open(result_file_path, "r") as result_file: